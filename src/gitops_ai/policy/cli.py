@@ -9,6 +9,7 @@ Usage:
     python -m src.git_policy.cli --validate-last
 """
 
+import re
 import sys
 import click
 from rich.console import Console
@@ -17,6 +18,13 @@ from rich.table import Table
 
 console = Console()
 
+# Commit message rules, compiled once at import time
+SUBJECT_PATTERN = re.compile(
+    r'^(feat|fix|docs|style|refactor|perf|test|build|ci|chore|revert|security)(\([a-z-]+\))?(!)?:\s.{1,100}$'
+)
+METADATA_PATTERN = re.compile(r'^(\w+)(?:\(([a-z-]+)\))?(!)?: (.+)$')
+TICKET_PATTERN = re.compile(r'(EHR|PAY|DEV|SEC|COMP)-\d+')
+
 
 @click.command()
 @click.argument('commit_msg_file', type=click.Path(exists=True), required=False)
@@ -88,10 +96,7 @@ def validate_commit_message(commit_msg: str, config_path: str) -> dict:
     subject = lines[0]
     
     # Check Conventional Commits format: type(scope): description
-    import re
-    pattern = r'^(feat|fix|docs|style|refactor|perf|test|build|ci|chore|revert|security)(\([a-z-]+\))?(!)?:\s.{1,100}$'
-    
-    if not re.match(pattern, subject):
+    if not SUBJECT_PATTERN.match(subject):
         errors.append(
             "Subject line must follow Conventional Commits format:\n"
             "  type(scope): description\n"
@@ -99,7 +104,7 @@ def validate_commit_message(commit_msg: str, config_path: str) -> dict:
         )
     else:
         # Extract metadata
-        match = re.match(r'^(\w+)(?:\(([a-z-]+)\))?(!)?: (.+)$', subject)
+        match = METADATA_PATTERN.match(subject)
         if match:
             metadata['type'] = match.group(1)
             metadata['scope'] = match.group(2) or 'general'
@@ -120,8 +125,7 @@ def validate_commit_message(commit_msg: str, config_path: str) -> dict:
             warnings.append("PHI-related changes should reference compliance framework")
     
     # Check for ticket reference
-    ticket_pattern = r'(EHR|PAY|DEV|SEC|COMP)-\d+'
-    if not re.search(ticket_pattern, commit_msg):
+    if not TICKET_PATTERN.search(commit_msg):
         warnings.append("No ticket reference found (recommended: EHR-XXX, SEC-XXX, etc.)")
     
     return {
@@ -132,9 +132,10 @@ def check_phi_logging(phi_paths: list) -> dict:
                 with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
                     content = f.read()
                     for line_num, line in enumerate(content.split('\n'), 1):
-                        if 'log' in line.lower() or 'print' in line.lower():
+                        line_lower = line.lower()
+                        if 'log' in line_lower or 'print' in line_lower:
                             for term in forbidden_log_terms:
-                                if term in line.lower():
+                                if term in line_lower:
                                     violations.append(f"{py_file}:{line_num} - {line.strip()}")
     
     return {
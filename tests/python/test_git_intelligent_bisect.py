@@ -0,0 +1,235 @@
+"""
+Unit Tests for Intelligent Bisect
+
+Tests the generated bisect script against a real scratch repository.
+"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from git_intel.git_intelligent_bisect import CommitInfo, IntelligentBisect
+
+
+def git(repo: Path, *args: str) -> str:
+    """Run a git command in repo and return its stripped stdout."""
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def commit_file(repo: Path, name: str, message: str) -> str:
+    """Write name, commit it with message and return the new sha."""
+    (repo / name).write_text(f"{name}\n")
+    git(repo, "add", name)
+    git(repo, "commit", "-q", "-m", message)
+    return git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def bisect_repo(temp_repo: Path, monkeypatch) -> dict:
+    """
+    A repository on branch 'work' whose third commit adds a 'broken' marker.
+
+    Returns:
+        Dictionary with the repo path and the good, culprit and bad shas
+    """
+    git(temp_repo, "checkout", "-q", "-b", "work")
+    good = git(temp_repo, "rev-parse", "HEAD")
+    commit_file(temp_repo, "a.txt", "feat: add a")
+    culprit = commit_file(temp_repo, "broken", "feat: add broken marker")
+    bad = commit_file(temp_repo, "b.txt", "feat: add b")
+    monkeypatch.chdir(temp_repo)
+    return {"repo": temp_repo, "good": good, "culprit": culprit, "bad": bad}
+
+
+def run_script(repo: Path, script: str) -> subprocess.CompletedProcess:
+    """Run a generated bisect script inside repo."""
+    return subprocess.run(
+        ["bash", "-c", script], cwd=repo, capture_output=True, text=True
+    )
+
+
+@pytest.mark.requires_git
+class TestGenerateBisectScript:
+    """The generated script finds the culprit and restores the checkout."""
+
+    TEST_COMMAND = "test ! -f broken"
+
+    def test_fallback_bisect_returns_to_branch(self, bisect_repo, tmp_path):
+        """Probes pass, git bisect run finds the culprit, HEAD is back on 'work'."""
+        bisect = IntelligentBisect()
+        commits = bisect.get_commits_info_in_range(bisect_repo["good"], bisect_repo["bad"])
+        # Only probe the commit before the culprit so the fallback runs
+        probes = [c for c in commits if c.message == "feat: add a"]
+        tested = tmp_path / "tested.txt"
+        script = bisect.generate_bisect_script(
+            probes, f"{{ git rev-parse HEAD >> '{tested}'; {self.TEST_COMMAND}; }}",
+            good_commit=bisect_repo["good"], bad_commit=bisect_repo["bad"]
+        )
+
+        result = run_script(bisect_repo["repo"], script)
+
+        assert result.returncode == 1, result.stderr
+        assert f"Culprit commit: {bisect_repo['culprit']}" in result.stdout
+        assert git(bisect_repo["repo"], "symbolic-ref", "--short", "HEAD") == "work"
+        # The probe is marked good, so the fallback never tests it again
+        assert tested.read_text().split().count(probes[0].sha) == 1
+
+    def test_fallback_bisect_failure_exits_2(self, bisect_repo):
+        """A git bisect run that aborts is reported apart from a found culprit."""
+        script = IntelligentBisect().generate_bisect_script(
+            [], "exit 200",
+            good_commit=bisect_repo["good"], bad_commit=bisect_repo["bad"]
+        )
+
+        result = run_script(bisect_repo["repo"], script)
+
+        assert result.returncode == 2
+        assert "Culprit commit" not in result.stdout
+        assert git(bisect_repo["repo"], "symbolic-ref", "--short", "HEAD") == "work"
+
+    def test_culprit_probe_returns_to_branch(self, bisect_repo):
+        """A failing probe exits 1 and checks the original branch back out."""
+        bisect = IntelligentBisect()
+        commits = bisect.get_commits_info_in_range(bisect_repo["good"], bisect_repo["bad"])
+        script = bisect.generate_bisect_script(
+            commits, self.TEST_COMMAND,
+            good_commit=bisect_repo["good"], bad_commit=bisect_repo["bad"]
+        )
+
+        result = run_script(bisect_repo["repo"], script)
+
+        assert result.returncode == 1
+        assert "THIS IS THE CULPRIT" in result.stdout
+        assert git(bisect_repo["repo"], "symbolic-ref", "--short", "HEAD") == "work"
+
+    def test_probes_without_range_return_to_branch(self, bisect_repo):
+        """Without a good/bad range the script still ends on the original branch."""
+        bisect = IntelligentBisect()
+        commits = bisect.get_commits_info_in_range(bisect_repo["good"], bisect_repo["bad"])
+        probes = [c for c in commits if c.message == "feat: add a"]
+        script = bisect.generate_bisect_script(probes, self.TEST_COMMAND)
+
+        result = run_script(bisect_repo["repo"], script)
+
+        assert result.returncode == 0, result.stderr
+        assert git(bisect_repo["repo"], "symbolic-ref", "--short", "HEAD") == "work"
+
+
+@pytest.mark.requires_git
+class TestGetCommitsInfoInRange:
+    """The single git log -z call is parsed back into CommitInfo records."""
+
+    def test_subject_with_pipe_and_metadata(self, bisect_repo):
+        """'|' in a subject stays in the message and body metadata is parsed."""
+        repo = bisect_repo["repo"]
+        (repo / "svc").mkdir()
+        (repo / "svc" / "phi.py").write_text("x = 1\n")
+        git(repo, "add", "svc/phi.py")
+        git(repo, "commit", "-q", "-m", "fix: a | b || c",
+            "-m", "PHI-Impact: Direct\nService: phi-service")
+        head = git(repo, "rev-parse", "HEAD")
+
+        commits = IntelligentBisect().get_commits_info_in_range(bisect_repo["bad"], "HEAD")
+
+        assert len(commits) == 1
+        commit = commits[0]
+        assert commit.sha == head
+        assert commit.short_sha == head[:len(commit.short_sha)]
+        assert commit.message == "fix: a | b || c"
+        assert commit.author == "Test User"
+        assert commit.files_changed == ["svc/phi.py"]
+        assert commit.metadata["phi_impact"] == "direct"
+        assert commit.metadata["service"] == "phi-service"
+
+    def test_empty_and_merge_commits_have_no_files(self, bisect_repo):
+        """Commits with no file list parse cleanly alongside ones that have files."""
+        repo = bisect_repo["repo"]
+        git(repo, "commit", "-q", "--allow-empty", "-m", "chore: empty")
+        git(repo, "checkout", "-q", "-b", "side")
+        commit_file(repo, "side.txt", "feat: side change")
+        git(repo, "checkout", "-q", "work")
+        commit_file(repo, "main.txt", "feat: main change")
+        git(repo, "merge", "-q", "--no-ff", "-m", "Merge branch 'side'", "side")
+
+        commits = IntelligentBisect().get_commits_info_in_range(bisect_repo["bad"], "HEAD")
+        by_message = {c.message: c for c in commits}
+
+        assert len(commits) == 4
+        assert commits[0].message == "Merge branch 'side'"
+        assert by_message["Merge branch 'side'"].files_changed == []
+        assert by_message["chore: empty"].files_changed == []
+        assert by_message["feat: side change"].files_changed == ["side.txt"]
+        assert by_message["feat: main change"].files_changed == ["main.txt"]
+
+    def test_matches_per_commit_lookup(self, bisect_repo):
+        """The batched parse agrees with the per-commit get_commit_info path."""
+        bisect = IntelligentBisect()
+        batched = bisect.get_commits_info_in_range(bisect_repo["good"], bisect_repo["bad"])
+
+        assert [c.sha for c in batched] == bisect.get_commits_in_range(
+            bisect_repo["good"], bisect_repo["bad"]
+        )
+        for commit in batched:
+            single = IntelligentBisect().get_commit_info(commit.sha)
+            assert single.files_changed == commit.files_changed
+            assert single.metadata == commit.metadata
+
+
+class TestBisectPathspec:
+    """--paths is passed to git bisect start as a quoted pathspec."""
+
+    def test_pathspec_is_quoted(self):
+        """Spaces and shell metacharacters in paths stay literal."""
+        script = IntelligentBisect().generate_bisect_script(
+            [], "make test", good_commit="v1.0.0", bad_commit="HEAD",
+            paths=["services/phi service", "a;touch pwned", "$(id)"]
+        )
+
+        assert (
+            "git bisect start \"$BAD\" \"$GOOD\" -- "
+            "'services/phi service' 'a;touch pwned' '$(id)'"
+        ) in script.splitlines()
+
+    def test_no_pathspec_without_paths(self):
+        """Without paths the bisect covers the whole range."""
+        script = IntelligentBisect().generate_bisect_script(
+            [], "make test", good_commit="v1.0.0", bad_commit="HEAD"
+        )
+
+        assert 'git bisect start "$BAD" "$GOOD"' in script.splitlines()
+
+    def test_probes_marked_good(self):
+        """Probed commits are marked good right after git bisect start."""
+        commits = [
+            CommitInfo(sha=sha, short_sha=sha[:7], message="m", author="a",
+                       date="d", files_changed=[], metadata={})
+            for sha in ("a" * 40, "b" * 40)
+        ]
+        lines = IntelligentBisect().generate_bisect_script(
+            commits, "make test", good_commit="v1.0.0", bad_commit="HEAD"
+        ).splitlines()
+
+        start = lines.index('git bisect start "$BAD" "$GOOD"')
+        assert lines[start + 1] == f"git bisect good {'a' * 40} {'b' * 40}"
+
+    @pytest.mark.requires_git
+    def test_pathspec_bisect_finds_culprit(self, bisect_repo):
+        """A bisect limited to a path with a space still finds the culprit."""
+        repo = bisect_repo["repo"]
+        (repo / "phi service").mkdir()
+        commit_file(repo, "phi service/ok.txt", "feat: phi ok")
+        culprit = commit_file(repo, "phi service/broken", "feat: phi broken")
+        commit_file(repo, "c.txt", "feat: add c")
+        script = IntelligentBisect().generate_bisect_script(
+            [], "test ! -f 'phi service/broken'",
+            good_commit=bisect_repo["bad"], bad_commit="HEAD", paths=["phi service"]
+        )
+
+        result = run_script(repo, script)
+
+        assert result.returncode == 1, result.stderr
+        assert f"Culprit commit: {culprit}" in result.stdout
+        assert git(repo, "symbolic-ref", "--short", "HEAD") == "work"
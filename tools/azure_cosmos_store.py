@@ -72,6 +72,7 @@ License: MIT
 import asyncio
 import logging
 import os
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
@@ -87,11 +88,7 @@ except ImportError:
         "Install with: pip install azure-cosmos azure-identity"
     )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Handlers are configured by the CLI entry point (main), not on import
 logger = logging.getLogger(__name__)
 
 
@@ -278,9 +275,9 @@ class AzureCosmosStore:
         }
 
         try:
-            start_time = datetime.now(timezone.utc)
+            start_time = time.perf_counter()
             result = await self.container.upsert_item(body=document)
-            elapsed_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
 
             # Log slow queries (> 100ms)
             if elapsed_ms > 100:
@@ -325,11 +322,11 @@ class AzureCosmosStore:
 
         tenant_id = tenant_id or self.tenant_id
 
-        # Default date range: last 30 days
-        if not start_date:
-            start_date = (datetime.now(timezone.utc) - timedelta(days=30)).strftime("%Y-%m-%d")
-        if not end_date:
-            end_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        # Default date range: last 30 days (both ends from the same clock reading)
+        if not start_date or not end_date:
+            now = datetime.now(timezone.utc)
+            start_date = start_date or (now - timedelta(days=30)).strftime("%Y-%m-%d")
+            end_date = end_date or now.strftime("%Y-%m-%d")
 
         query = """
             SELECT * FROM c
@@ -346,7 +343,7 @@ class AzureCosmosStore:
         ]
 
         try:
-            start_time = datetime.now(timezone.utc)
+            start_time = time.perf_counter()
             items = self.container.query_items(
                 query=query,
                 parameters=parameters,
@@ -355,7 +352,7 @@ class AzureCosmosStore:
             )
 
             results = [item async for item in items]
-            elapsed_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
 
             logger.info(
                 f"Query returned {len(results)} commits "
@@ -449,6 +446,11 @@ async def main():
     """CLI for testing Azure Cosmos DB integration"""
     import argparse
 
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
     parser = argparse.ArgumentParser(
         description="Azure Cosmos DB Storage - GitOps 2.0 Healthcare Intelligence"
     )
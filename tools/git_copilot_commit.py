@@ -18,30 +18,131 @@ License: MIT
 """
 
 import argparse
+import copy
+import fnmatch
 import os
+import re
 import subprocess
 import sys
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-import yaml
-
-# OpenAI for AI-powered analysis
-try:
-    from openai import OpenAI, OpenAIError, APIError
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    print("⚠️  OpenAI library not installed. Install with: pip install openai", file=sys.stderr)
-    # Define fallback exception types
-    class OpenAIError(Exception):
-        pass
-    class APIError(OpenAIError):
-        pass
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+
+@lru_cache(maxsize=1)
+def _import_openai():
+    """
+    Import the OpenAI client class on first use
+
+    WHY: the SDK (and yaml, see _load_config) is only needed once analysis
+    starts, so --help and argument errors no longer pay for the import.
+    Returns None when the library is not installed.
+    """
+    try:
+        from openai import OpenAI
+    except ImportError:
+        print("⚠️  OpenAI library not installed. Install with: pip install openai", file=sys.stderr)
+        return None
+    return OpenAI
 
 # Load configuration
 CONFIG_FILE = Path(__file__).parent.parent / ".copilot" / "healthcare-commit-guidelines.yml"
 
+# Parsed configs keyed by (path, mtime_ns, size) so repeated generators skip YAML parsing
+_CONFIG_CACHE: "OrderedDict[Tuple[str, int, int], Dict]" = OrderedDict()
+_CONFIG_CACHE_SIZE = 16
+
+# Maximum diff characters sent to the model (~12k tokens)
+DIFF_CHAR_LIMIT = 50000
+
+# Template placeholders the AI leaves for us to fill in (substituted in one pass)
+PLACEHOLDER_PATTERN = re.compile(r"<(risk_level|clinical_safety|timestamp|model_name|file_count)>")
+
+# Leading/trailing markdown code fences the AI sometimes wraps its answer in
+CODE_FENCE_PATTERN = re.compile(r"\A```(?:plaintext)?\n*|\n*```\Z")
+
+RISK_LEVELS = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+
+# Static system prompt sent with every AI commit message request
+SYSTEM_PROMPT = """You are an AI assistant specializing in healthcare compliance and GitOps 2.0 engineering.
+Generate a structured, machine-readable commit message that serves as a compliance artifact.
+The commit must be audit-ready and contain all required regulatory metadata.
+
+Follow this EXACT format:
+
+<type>(<scope>): <description>
+
+Business Impact: <one sentence describing business value>
+Risk Level: <risk_level>
+Clinical Safety: <clinical_safety>
+Compliance: <comma-separated compliance domains>
+
+<Compliance-Specific Sections>
+
+Testing: <required tests>
+Validation: <validation status>
+Reviewers: <required reviewers>
+
+Audit Trail: <file_count> files modified at <timestamp>
+AI Model: <model_name>
+
+Rules:
+- Description must be 20-100 characters
+- Use conventional commit types: feat, fix, security, perf, breaking, chore, docs, test, refactor
+- Be specific and technical
+- Focus on WHAT changed and WHY it matters for healthcare
+- Include specific compliance framework sections (HIPAA, FDA, SOX) when applicable
+"""
+
+
+@lru_cache(maxsize=128)
+def _compile_globs(patterns: Tuple[str, ...]) -> Optional[Pattern]:
+    """
+    Compile a group of glob patterns into a single regex
+
+    Matching one alternation is much cheaper than calling fnmatch once per
+    pattern for every modified file. Returns None for an empty group.
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns))
+
+
+@lru_cache(maxsize=32)
+def _compile_risk_regex(level_patterns: Tuple[Tuple[str, ...], ...]) -> Optional[Pattern]:
+    """
+    Compile every risk level's globs into one regex with a named group per level
+
+    Groups are ordered from CRITICAL to LOW, so the first alternative that
+    matches is the highest risk level; ``match.lastgroup`` ("L<index>")
+    identifies it in a single scan. Returns None if no level has patterns.
+    """
+    groups = [
+        f"(?P<L{index}>{'|'.join(fnmatch.translate(p) for p in patterns)})"
+        for index, patterns in enumerate(level_patterns)
+        if patterns
+    ]
+    return re.compile("|".join(groups)) if groups else None
+
+
+# Clinical safety patterns (first group requires review, second needs validation),
+# compiled once at import since they do not depend on the loaded config
+CLINICAL_REVIEW_PATTERNS = ("services/medical-device/**", "**/*diagnostic*", "**/*clinical-decision*")
+CLINICAL_VALIDATION_PATTERNS = ("services/phi-service/**", "**/*patient*")
+CLINICAL_REVIEW_REGEX = _compile_globs(CLINICAL_REVIEW_PATTERNS)
+CLINICAL_VALIDATION_REGEX = _compile_globs(CLINICAL_VALIDATION_PATTERNS)
+
+
+@dataclass
+class FileClassification:
+    """Risk, clinical safety and compliance findings for a set of modified files"""
+    risk_level: str
+    clinical_safety: str
+    compliance_domains: List[str]
+
 
 class GitCopilotCommit:
     """
@@ -62,20 +163,35 @@ class GitCopilotCommit:
         if not api_key:
             api_key = os.getenv("OPENAI_API_KEY")
 
-        if not api_key and OPENAI_AVAILABLE:
+        openai_client_class = _import_openai()
+
+        if not api_key and openai_client_class is not None:
             print("⚠️  OPENAI_API_KEY not set. Set it with: export OPENAI_API_KEY=your-key", file=sys.stderr)
             sys.exit(1)
 
-        if OPENAI_AVAILABLE:
-            self.client = OpenAI(api_key=api_key)
+        if openai_client_class is not None:
+            self.client = openai_client_class(api_key=api_key)
         else:
             self.client = None
 
     def _load_config(self) -> Dict:
-        """Load healthcare commit guidelines configuration"""
+        """Load healthcare commit guidelines configuration (cached until the file changes)"""
         try:
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            stat = CONFIG_FILE.stat()
+            key = (str(CONFIG_FILE), stat.st_mtime_ns, stat.st_size)
+            if key in _CONFIG_CACHE:
+                _CONFIG_CACHE.move_to_end(key)
+            else:
+                import yaml  # Deferred: only needed once a generator is created
+
+                # libyaml-backed loader when available, pure-Python otherwise
+                loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+                with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+                    _CONFIG_CACHE[key] = yaml.load(f, Loader=loader)
+                if len(_CONFIG_CACHE) > _CONFIG_CACHE_SIZE:
+                    _CONFIG_CACHE.popitem(last=False)
+            # Callers may mutate their config, so never hand out the cached object
+            return copy.deepcopy(_CONFIG_CACHE[key])
         except (FileNotFoundError, IOError) as e:
             print(f"⚠️  Configuration file error: {e}", file=sys.stderr)
             return self._default_config()
@@ -96,8 +212,13 @@ class GitCopilotCommit:
             }
         }
 
-    def get_git_diff(self, ref: str = "HEAD") -> Tuple[List[str], str]:
-        """Get modified files and diff content"""
+    def get_git_diff(self, ref: str = "HEAD", include_diff: bool = True) -> Tuple[List[str], str]:
+        """
+        Get modified files and diff content
+
+        With include_diff=False only the file list is fetched and the diff
+        text is returned empty (the fallback template never reads it).
+        """
         try:
             # Get list of changed files
             result = subprocess.run(
@@ -108,71 +229,93 @@ class GitCopilotCommit:
             )
             files = [f.strip() for f in result.stdout.strip().split('\n') if f.strip()]
 
-            # Get diff content (limit to 10000 lines for token management)
-            result = subprocess.run(
-                ["git", "diff", ref],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            diff_text = result.stdout[:50000]  # Limit to ~12k tokens
+            if not include_diff or not files:
+                return files, ""
+
+            # Get diff content, reading only up to the limit (~12k tokens) from the pipe
+            # so a huge diff is never materialized just to be truncated
+            cmd = ["git", "diff", ref]
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True) as proc:
+                diff_text = proc.stdout.read(DIFF_CHAR_LIMIT)
+                if len(diff_text) == DIFF_CHAR_LIMIT:
+                    proc.kill()  # Rest of the diff is not needed
+                elif proc.wait() != 0:
+                    raise subprocess.CalledProcessError(proc.returncode, cmd)
 
             return files, diff_text
         except subprocess.CalledProcessError:
             print("❌ Git command failed. Make sure you're in a git repository.", file=sys.stderr)
             sys.exit(1)
 
-    def assess_risk_level(self, files: List[str]) -> str:
-        """Determine risk level based on modified files"""
-        risk_patterns = self.config.get("risk_patterns", {})
+    def _classify_files(self, files: List[str]) -> FileClassification:
+        """
+        Classify modified files in a single pass
 
-        for risk_level in ["CRITICAL", "HIGH", "MEDIUM", "LOW"]:
-            patterns = risk_patterns.get(risk_level, [])
-            for file in files:
-                for pattern in patterns:
-                    # Simple pattern matching (could use fnmatch for wildcards)
-                    if self._matches_pattern(file, pattern):
-                        return risk_level
+        Risk level, clinical safety and compliance domains are all derived
+        from the same walk over ``files`` instead of one walk per assessment.
+        """
+        risk_patterns = self.config.get("risk_patterns", {})
+        compliance_mapping = self.config.get("compliance_mapping", {})
 
-        return "MEDIUM"  # Default
+        best_risk = len(RISK_LEVELS)
+        needs_review = False
+        needs_validation = False
+        domains = set()
 
-    def assess_clinical_safety(self, files: List[str]) -> str:
-        """Determine clinical safety impact"""
-        critical_patterns = ["services/medical-device/**", "**/*diagnostic*", "**/*clinical-decision*"]
-        medium_patterns = ["services/phi-service/**", "**/*patient*"]
+        risk_regex = _compile_risk_regex(tuple(tuple(risk_patterns.get(level, [])) for level in RISK_LEVELS))
+        domain_regexes = [
+            (domain, regex) for domain, patterns in compliance_mapping.items()
+            if (regex := _compile_globs(tuple(patterns))) is not None
+        ]
 
         for file in files:
-            for pattern in critical_patterns:
-                if self._matches_pattern(file, pattern):
-                    return "REQUIRES_CLINICAL_REVIEW"
+            # Highest risk level wins; nothing beats CRITICAL once it is seen
+            if best_risk and risk_regex is not None:
+                match = risk_regex.match(file)
+                if match:
+                    best_risk = min(best_risk, int(match.lastgroup[1:]))
+
+            if not needs_review:
+                if CLINICAL_REVIEW_REGEX.match(file):
+                    needs_review = True
+                elif not needs_validation and CLINICAL_VALIDATION_REGEX.match(file):
+                    needs_validation = True
+
+            for domain, regex in domain_regexes:
+                if domain not in domains and regex.match(file):
+                    domains.add(domain)
+
+            # Nothing left to learn: CRITICAL risk, clinical review and every domain found
+            if best_risk == 0 and needs_review and len(domains) == len(domain_regexes):
+                break
+
+        if needs_review:
+            clinical_safety = "REQUIRES_CLINICAL_REVIEW"
+        elif needs_validation:
+            clinical_safety = "CLINICAL_VALIDATION_NEEDED"
+        else:
+            clinical_safety = "NO_CLINICAL_IMPACT"
 
-        for file in files:
-            for pattern in medium_patterns:
-                if self._matches_pattern(file, pattern):
-                    return "CLINICAL_VALIDATION_NEEDED"
+        return FileClassification(
+            risk_level=RISK_LEVELS[best_risk] if best_risk < len(RISK_LEVELS) else "MEDIUM",  # Default
+            clinical_safety=clinical_safety,
+            compliance_domains=sorted(domains),
+        )
 
-        return "NO_CLINICAL_IMPACT"
+    def assess_risk_level(self, files: List[str]) -> str:
+        """Determine risk level based on modified files"""
+        return self._classify_files(files).risk_level
+
+    def assess_clinical_safety(self, files: List[str]) -> str:
+        """Determine clinical safety impact"""
+        return self._classify_files(files).clinical_safety
 
     def detect_compliance_domains(self, files: List[str]) -> List[str]:
         """Detect applicable compliance frameworks"""
-        compliance_mapping = self.config.get("compliance_mapping", {})
-        domains = set()
-
-        for domain, patterns in compliance_mapping.items():
-            for file in files:
-                for pattern in patterns:
-                    if self._matches_pattern(file, pattern):
-                        domains.add(domain)
+        return self._classify_files(files).compliance_domains
 
-        return sorted(list(domains))
-
-    def _matches_pattern(self, file: str, pattern: str) -> bool:
-        """Simple pattern matching (supports ** wildcards)"""
-        import fnmatch
-        return fnmatch.fnmatch(file, pattern)
-
-    def suggest_reviewers(self, compliance_domains: List[str], risk_level: str) -> List[str]:
-        """Suggest required reviewers based on compliance and risk"""
+    def suggest_reviewers(self, compliance_domains: Iterable[str], risk_level: str) -> List[str]:
+        """Suggest required reviewers based on compliance and risk (domains may be any iterable, e.g. a set)"""
         reviewer_mapping = self.config.get("reviewer_mapping", {})
         reviewers = set()
 
@@ -184,7 +327,7 @@ class GitCopilotCommit:
         elif risk_level == "HIGH":
             reviewers.update(reviewer_mapping.get("HIGH_RISK", []))
 
-        return sorted(list(reviewers))
+        return sorted(reviewers)
 
     def generate_commit_message(
         self,
@@ -199,51 +342,24 @@ class GitCopilotCommit:
         This is the core GitOps 2.0 feature: AI writes the compliance story
         while developers write code.
         """
-        if not self.client:
-            return self._generate_fallback_message(files, scope)
-
-        # Assess metadata
-        risk_level = self.assess_risk_level(files)
-        clinical_safety = self.assess_clinical_safety(files)
-        compliance_domains = self.detect_compliance_domains(files)
+        # One audit timestamp per message, shared by the AI and fallback paths
+        timestamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
 
-        if compliance_hint:
-            compliance_domains.append(compliance_hint)
-            compliance_domains = sorted(list(set(compliance_domains)))
+        # Assess metadata (one pass over the modified files, shared with the fallback)
+        classification = self._classify_files(files)
 
-        reviewers = self.suggest_reviewers(compliance_domains, risk_level)
-
-        # Construct AI prompt
-        system_prompt = """You are an AI assistant specializing in healthcare compliance and GitOps 2.0 engineering.
-Generate a structured, machine-readable commit message that serves as a compliance artifact.
-The commit must be audit-ready and contain all required regulatory metadata.
-
-Follow this EXACT format:
-
-<type>(<scope>): <description>
-
-Business Impact: <one sentence describing business value>
-Risk Level: <risk_level>
-Clinical Safety: <clinical_safety>
-Compliance: <comma-separated compliance domains>
-
-<Compliance-Specific Sections>
-
-Testing: <required tests>
-Validation: <validation status>
-Reviewers: <required reviewers>
+        if not self.client:
+            return self._generate_fallback_message(files, scope, timestamp=timestamp, classification=classification)
+        risk_level = classification.risk_level
+        clinical_safety = classification.clinical_safety
+        compliance_domains = classification.compliance_domains
 
-Audit Trail: <file_count> files modified at <timestamp>
-AI Model: <model_name>
+        if compliance_hint and compliance_hint not in compliance_domains:
+            compliance_domains = sorted({*compliance_domains, compliance_hint})
 
-Rules:
-- Description must be 20-100 characters
-- Use conventional commit types: feat, fix, security, perf, breaking, chore, docs, test, refactor
-- Be specific and technical
-- Focus on WHAT changed and WHY it matters for healthcare
-- Include specific compliance framework sections (HIPAA, FDA, SOX) when applicable
-"""
+        reviewers = self.suggest_reviewers(compliance_domains, risk_level)
 
+        # Construct AI prompt (the system prompt is the static SYSTEM_PROMPT)
         user_prompt = f"""Analyze this git diff and generate a compliant healthcare commit message.
 
 Modified files ({len(files)}):
@@ -264,7 +380,7 @@ Generate the commit message now following the exact format specified."""
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.3,  # Low temperature for consistency
@@ -273,55 +389,59 @@ Generate the commit message now following the exact format specified."""
 
             commit_message = response.choices[0].message.content.strip()
             
-            # Remove markdown code block formatting if present
-            # Handle various markdown formats: ```plaintext, ```, etc.
-            if commit_message.startswith("```plaintext"):
-                commit_message = commit_message[len("```plaintext"):].lstrip('\n')
-            elif commit_message.startswith("```"):
-                commit_message = commit_message[3:].lstrip('\n')
-            
-            if commit_message.endswith("```"):
-                commit_message = commit_message[:-3].rstrip('\n')
-            
-            commit_message = commit_message.strip()
-
-            # Inject actual metadata
-            commit_message = commit_message.replace("<risk_level>", risk_level)
-            commit_message = commit_message.replace("<clinical_safety>", clinical_safety)
-            commit_message = commit_message.replace("<timestamp>", datetime.now(timezone.utc).isoformat())
-            commit_message = commit_message.replace("<model_name>", self.model)
-            commit_message = commit_message.replace("<file_count>", str(len(files)))
+            # Remove markdown code block formatting if present (```plaintext, ```, etc.)
+            commit_message = CODE_FENCE_PATTERN.sub("", commit_message).strip()
+
+            # Inject actual metadata (single pass instead of one rebuild per placeholder)
+            placeholders = {
+                "risk_level": risk_level,
+                "clinical_safety": clinical_safety,
+                "timestamp": timestamp,
+                "model_name": self.model,
+                "file_count": str(len(files)),
+            }
+            commit_message = PLACEHOLDER_PATTERN.sub(
+                lambda m: placeholders[m.group(1)], commit_message
+            )
 
             return commit_message
 
         except ImportError as e:
             print(f"❌ OpenAI library not properly installed: {e}", file=sys.stderr)
-            return self._generate_fallback_message(files, scope)
+            return self._generate_fallback_message(files, scope, timestamp=timestamp, classification=classification)
         except AttributeError as e:
             print(f"❌ OpenAI API client error (check API key and version): {e}", file=sys.stderr)
-            return self._generate_fallback_message(files, scope)
+            return self._generate_fallback_message(files, scope, timestamp=timestamp, classification=classification)
         except (TimeoutError, ConnectionError) as e:
             print(f"❌ Network error connecting to OpenAI: {e}", file=sys.stderr)
-            return self._generate_fallback_message(files, scope)
+            return self._generate_fallback_message(files, scope, timestamp=timestamp, classification=classification)
         except ValueError as e:
             print(f"❌ Invalid parameter or response format: {e}", file=sys.stderr)
-            return self._generate_fallback_message(files, scope)
+            return self._generate_fallback_message(files, scope, timestamp=timestamp, classification=classification)
         except KeyError as e:
             print(f"❌ Unexpected response structure from OpenAI: {e}", file=sys.stderr)
-            return self._generate_fallback_message(files, scope)
+            return self._generate_fallback_message(files, scope, timestamp=timestamp, classification=classification)
         except Exception as e:
             # Last resort catch-all with detailed logging
             print(f"❌ Unexpected error during AI generation: {type(e).__name__}: {e}", file=sys.stderr)
-            return self._generate_fallback_message(files, scope)
+            return self._generate_fallback_message(files, scope, timestamp=timestamp, classification=classification)
 
-    def _generate_fallback_message(self, files: List[str], scope: Optional[str] = None) -> str:
+    def _generate_fallback_message(
+        self,
+        files: List[str],
+        scope: Optional[str] = None,
+        timestamp: Optional[str] = None,
+        classification: Optional[FileClassification] = None
+    ) -> str:
         """Fallback message when AI is unavailable"""
-        risk_level = self.assess_risk_level(files)
-        clinical_safety = self.assess_clinical_safety(files)
-        compliance_domains = self.detect_compliance_domains(files)
+        classification = classification or self._classify_files(files)
+        risk_level = classification.risk_level
+        clinical_safety = classification.clinical_safety
+        compliance_domains = classification.compliance_domains
         reviewers = self.suggest_reviewers(compliance_domains, risk_level)
 
         scope = scope or "core"
+        timestamp = timestamp or datetime.now(timezone.utc).isoformat(timespec="seconds")
 
         return f"""chore({scope}): update healthcare system components
 
@@ -334,7 +454,7 @@ Testing: Standard validation required
 Validation: Pending review
 Reviewers: {', '.join(reviewers) if reviewers else '@team'}
 
-Audit Trail: {len(files)} files modified at {datetime.now(timezone.utc).isoformat()}
+Audit Trail: {len(files)} files modified at {timestamp}
 AI Model: fallback-template
 
 ⚠️  This is a fallback message. Enable OpenAI for AI-generated compliance metadata.
@@ -402,7 +522,8 @@ Examples:
 
     # Get git changes
     print("📊 Analyzing git changes...")
-    files, diff_text = generator.get_git_diff()
+    # The diff text is only sent to the model; skip reading it when no client is configured
+    files, diff_text = generator.get_git_diff(include_diff=generator.client is not None)
 
     if not files:
         print("❌ No changes detected. Stage your changes first with 'git add'.")
@@ -24,12 +24,22 @@ import json
 import re
 import sys
 import argparse
+import shlex
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
 
 
-@dataclass
+# Commit message metadata fields (compiled once, applied to every commit in range)
+HIPAA_APPLICABLE_RE = re.compile(r'HIPAA:\s*(Applicable|COMPLIANT)', re.IGNORECASE)
+HIPAA_NOT_APPLICABLE_RE = re.compile(r'HIPAA:\s*Not\s*Applicable', re.IGNORECASE)
+PHI_IMPACT_RE = re.compile(r'PHI-Impact:\s*(\w+)', re.IGNORECASE)
+CLINICAL_SAFETY_RE = re.compile(r'Clinical-Safety:\s*([\w\s]+)', re.IGNORECASE)
+RISK_LEVEL_RE = re.compile(r'Risk-Level:\s*(\w+)', re.IGNORECASE)
+SERVICE_RE = re.compile(r'Service:\s*([\w-]+)', re.IGNORECASE)
+
+
+@dataclass(slots=True)
 class CommitInfo:
     """Information about a commit."""
     sha: str
@@ -90,32 +100,35 @@ class IntelligentBisect:
         - Risk-Level: High/Medium/Low
         - Service: service-name
         """
-        msg = self.get_commit_message(commit_sha)
+        return self.parse_commit_metadata(self.get_commit_message(commit_sha))
+    
+    def parse_commit_metadata(self, msg: str) -> Dict[str, str]:
+        """Parse structured metadata fields from a commit message body."""
         metadata = {}
         
         # Parse HIPAA
-        if re.search(r'HIPAA:\s*(Applicable|COMPLIANT)', msg, re.IGNORECASE):
+        if HIPAA_APPLICABLE_RE.search(msg):
             metadata['hipaa'] = 'applicable'
-        elif re.search(r'HIPAA:\s*Not\s*Applicable', msg, re.IGNORECASE):
+        elif HIPAA_NOT_APPLICABLE_RE.search(msg):
             metadata['hipaa'] = 'not_applicable'
         
         # Parse PHI-Impact
-        phi_match = re.search(r'PHI-Impact:\s*(\w+)', msg, re.IGNORECASE)
+        phi_match = PHI_IMPACT_RE.search(msg)
         if phi_match:
             metadata['phi_impact'] = phi_match.group(1).lower()
         
         # Parse Clinical-Safety
-        safety_match = re.search(r'Clinical-Safety:\s*([\w\s]+)', msg, re.IGNORECASE)
+        safety_match = CLINICAL_SAFETY_RE.search(msg)
         if safety_match:
             metadata['clinical_safety'] = safety_match.group(1).strip().lower()
         
         # Parse Risk-Level
-        risk_match = re.search(r'Risk-Level:\s*(\w+)', msg, re.IGNORECASE)
+        risk_match = RISK_LEVEL_RE.search(msg)
         if risk_match:
             metadata['risk_level'] = risk_match.group(1).lower()
         
         # Parse Service
-        service_match = re.search(r'Service:\s*([\w-]+)', msg, re.IGNORECASE)
+        service_match = SERVICE_RE.search(msg)
         if service_match:
             metadata['service'] = service_match.group(1).lower()
         
@@ -226,6 +239,49 @@ class IntelligentBisect:
         except subprocess.CalledProcessError:
             return []
     
+    def get_commits_info_in_range(self, good_commit: str, bad_commit: str) -> List[CommitInfo]:
+        """
+        Get CommitInfo for every commit between good and bad with one git call.
+        
+        A single `git log -z --name-only` replaces the rev-list plus three
+        subprocesses per commit (log, diff-tree, message) used by
+        get_commit_info. Commits come back in rev-list order and are cached.
+        """
+        try:
+            output = subprocess.check_output(
+                ['git', 'log', '-z', '--no-renames', '--name-only',
+                 '--format=%x1e%H%x1f%h%x1f%s%x1f%an%x1f%ai%x1f%B%x1f',
+                 f'{good_commit}..{bad_commit}'],
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                stderr=subprocess.DEVNULL
+            )
+        except subprocess.CalledProcessError:
+            return []
+        
+        commits = []
+        for record in output.split('\x1e')[1:]:
+            sha, short_sha, message, author, date, body, names = record.split('\x1f', 6)
+            # names is "\0" or "\0\nfile1\0file2\0..." (NUL-terminated, unquoted)
+            files = names.split('\x00')[1:]
+            if files and files[0].startswith('\n'):
+                files[0] = files[0][1:]
+            
+            commit = CommitInfo(
+                sha=sha,
+                short_sha=short_sha,
+                message=message,
+                author=author,
+                date=date,
+                files_changed=[f for f in files if f],
+                metadata=self.parse_commit_metadata(body.strip())
+            )
+            self.commits_cache[sha] = commit
+            commits.append(commit)
+        
+        return commits
+    
     def suggest_bisect_strategy(self, good_commit: str, bad_commit: str,
                                 incident_context: Dict) -> List[CommitInfo]:
         """
@@ -233,17 +289,14 @@ class IntelligentBisect:
         
         Returns commits sorted by priority (highest first).
         """
-        commit_shas = self.get_commits_in_range(good_commit, bad_commit)
+        commits_with_scores = self.get_commits_info_in_range(good_commit, bad_commit)
         
-        if not commit_shas:
+        if not commits_with_scores:
             return []
         
-        # Get commit info and calculate scores
-        commits_with_scores = []
-        for sha in commit_shas:
-            commit = self.get_commit_info(sha)
+        # Calculate scores
+        for commit in commits_with_scores:
             commit.priority_score = self.calculate_priority_score(commit, incident_context)
-            commits_with_scores.append(commit)
         
         # Sort by priority score (descending)
         commits_with_scores.sort(key=lambda c: c.priority_score, reverse=True)
@@ -251,8 +304,24 @@ class IntelligentBisect:
         return commits_with_scores
     
     def generate_bisect_script(self, commits: List[CommitInfo], 
-                               test_command: str) -> str:
-        """Generate a bash script for automated bisect testing."""
+                               test_command: str,
+                               good_commit: Optional[str] = None,
+                               bad_commit: Optional[str] = None,
+                               paths: Optional[List[str]] = None) -> str:
+        """
+        Generate a bash script for automated bisect testing.
+        
+        The top-priority commits are probed first. When the good/bad range
+        is given and every probe passes, the script falls back to
+        `git bisect run` over the whole range (log2(N) test runs instead of
+        leaving the remaining commits untested). `paths` limits that search
+        to commits touching the given pathspecs; probes that passed are
+        marked good so the fallback does not test them again. Every exit
+        path checks the starting branch (or commit) back out.
+        
+        Exit status: 1 when a culprit was found (by a probe or by the
+        fallback), 0 when none was found, 2 when `git bisect run` failed.
+        """
         script = [
             "#!/bin/bash",
             "# Intelligent bisect script generated by git_intelligent_bisect.py",
@@ -264,31 +333,65 @@ class IntelligentBisect:
             ""
         ]
         
+        # Remember where the user was so every exit path can return there
+        script.append("ORIG=$(git symbolic-ref -q --short HEAD || git rev-parse HEAD)")
+        script.append("")
+        
+        if good_commit and bad_commit:
+            # Pin the range before any checkout moves relative refs like HEAD
+            script.append(f"GOOD=$(git rev-parse --verify {shlex.quote(good_commit + '^{commit}')})")
+            script.append(f"BAD=$(git rev-parse --verify {shlex.quote(bad_commit + '^{commit}')})")
+            script.append("")
+        
         for i, commit in enumerate(commits[:10], 1):  # Top 10
             script.append(f"echo ''")
             script.append(f"echo '━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━'")
             script.append(f"echo '🔍 Testing commit {i}/10: {commit.short_sha}'")
-            script.append(f"echo '   {commit.message}'")
+            # Commit metadata is untrusted text: quote it so quotes or $(...) stay literal
+            script.append(f"echo {shlex.quote('   ' + commit.message)}")
             script.append(f"echo '   Priority Score: {commit.priority_score}/100'")
             script.append(f"echo '━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━'")
             script.append(f"")
-            script.append(f"git checkout {commit.sha} --quiet")
+            script.append(f"git checkout {shlex.quote(commit.sha)} --quiet")
             script.append(f"")
             script.append(f"if {test_command}; then")
             script.append(f"    echo '✅ Test passed - not the culprit'")
             script.append(f"else")
             script.append(f"    echo '❌ Test failed - THIS IS THE CULPRIT!'")
             script.append(f"    echo ''")
-            script.append(f"    echo 'Culprit commit: {commit.sha}'")
-            script.append(f"    echo 'Message: {commit.message}'")
-            script.append(f"    echo 'Author: {commit.author}'")
-            script.append(f"    echo 'Date: {commit.date}'")
+            script.append(f"    echo {shlex.quote('Culprit commit: ' + commit.sha)}")
+            script.append(f"    echo {shlex.quote('Message: ' + commit.message)}")
+            script.append(f"    echo {shlex.quote('Author: ' + commit.author)}")
+            script.append(f"    echo {shlex.quote('Date: ' + commit.date)}")
+            script.append(f'    git checkout "$ORIG" --quiet')
             script.append(f"    exit 1")
             script.append(f"fi")
             script.append(f"")
         
         script.append("echo ''")
-        script.append("echo '✅ All tested commits passed. Culprit may be in untested commits.'")
+        if good_commit and bad_commit:
+            script.append("echo '✅ All priority commits passed. Falling back to git bisect over the full range...'")
+            pathspec = f" -- {shlex.join(paths)}" if paths else ""
+            script.append(f'git bisect start "$BAD" "$GOOD"{pathspec}')
+            if commits:
+                # Reaching the fallback means every probe passed
+                probed = ' '.join(shlex.quote(c.sha) for c in commits[:10])
+                script.append(f"git bisect good {probed}")
+            script.append(f"if git bisect run sh -c {shlex.quote(test_command)}; then")
+            script.append("    CULPRIT=$(git rev-parse refs/bisect/bad)")
+            script.append('    git bisect reset "$ORIG"')
+            script.append("    echo ''")
+            script.append('    echo "Culprit commit: $CULPRIT"')
+            script.append("    git log -1 --format='Message: %s%nAuthor: %an%nDate: %ai' \"$CULPRIT\"")
+            script.append("    exit 1")
+            script.append("else")
+            script.append("    echo '⚠️  git bisect run failed'")
+            script.append('    git bisect reset "$ORIG"')
+            script.append("    exit 2")
+            script.append("fi")
+        else:
+            script.append("echo '✅ All tested commits passed. Culprit may be in untested commits.'")
+            script.append('git checkout "$ORIG" --quiet')
         
         return '\n'.join(script)
 
@@ -329,6 +432,9 @@ Examples:
                        help='Generate automated bisect script')
     parser.add_argument('--test-command', default='make test',
                        help='Test command for automated script (default: make test)')
+    parser.add_argument('--paths', nargs='+', metavar='PATH',
+                       help='Only bisect commits touching these paths in the generated script '
+                            '(e.g., services/ tests/)')
     parser.add_argument('--format', choices=['text', 'json'], default='text',
                        help='Output format')
     
@@ -374,7 +480,9 @@ Examples:
                     for c in commits[:args.top]
                 ]
             }
-            print(json.dumps(output, indent=2))
+            # Stream straight to stdout instead of building the whole document first
+            json.dump(output, sys.stdout, indent=2)
+            sys.stdout.write("\n")
         
         else:  # text format
             print("\n🔍 Intelligent Bisect Analysis")
@@ -418,7 +526,9 @@ Examples:
         
         # Generate automated script if requested
         if args.generate_script:
-            script_content = bisect.generate_bisect_script(commits, args.test_command)
+            script_content = bisect.generate_bisect_script(
+                commits, args.test_command, args.good, args.bad, args.paths
+            )
             with open(args.generate_script, 'w', encoding='utf-8') as f:
                 f.write(script_content)
             print(f"\n✅ Automated bisect script generated: {args.generate_script}")
@@ -172,9 +172,15 @@ class MetadataVerifier:
         
         return True, warnings
     
+    def get_file_diffs(self, files: List[str],
+                       commit_ref: str = "HEAD") -> Dict[str, str]:
+        """Fetch the content of each changed file once for all keyword checks."""
+        return {f: self.get_file_diff(f, commit_ref) for f in files}
+    
     def analyze_phi_impact_mismatch(self, declared_phi: str,
                                    actual_files: List[str],
-                                   commit_ref: str) -> Tuple[bool, List[str]]:
+                                   commit_ref: str,
+                                   file_diffs: Optional[Dict[str, str]] = None) -> Tuple[bool, List[str]]:
         """Check if PHI-Impact declaration matches actual changes."""
         warnings = []
         
@@ -191,7 +197,10 @@ class MetadataVerifier:
         
         # Check for PHI keywords in code changes
         for file_path in actual_files:
-            diff = self.get_file_diff(file_path, commit_ref)
+            if file_diffs is not None and file_path in file_diffs:
+                diff = file_diffs[file_path]
+            else:
+                diff = self.get_file_diff(file_path, commit_ref)
             phi_keywords_found = [kw for kw in self.PHI_KEYWORDS if kw in diff]
             
             if phi_keywords_found and declared_phi == 'none':
@@ -204,7 +213,8 @@ class MetadataVerifier:
     
     def analyze_hipaa_applicability(self, declared_hipaa: str,
                                    actual_files: List[str],
-                                   commit_ref: str) -> Tuple[bool, List[str]]:
+                                   commit_ref: str,
+                                   file_diffs: Optional[Dict[str, str]] = None) -> Tuple[bool, List[str]]:
         """Check if HIPAA declaration is appropriate."""
         warnings = []
         
@@ -224,7 +234,10 @@ class MetadataVerifier:
         
         # Check for encryption changes
         for file_path in actual_files:
-            diff = self.get_file_diff(file_path, commit_ref)
+            if file_diffs is not None and file_path in file_diffs:
+                diff = file_diffs[file_path]
+            else:
+                diff = self.get_file_diff(file_path, commit_ref)
             encryption_keywords = [kw for kw in self.ENCRYPTION_KEYWORDS if kw in diff]
             
             if encryption_keywords and declared_hipaa != 'applicable':
@@ -283,6 +296,9 @@ class MetadataVerifier:
                 recommendations=[]
             )
         
+        # Both keyword checks scan every file; fetch each one only once
+        file_diffs = self.get_file_diffs(files, commit_ref)
+        
         # Run all verification checks
         all_warnings = []
         all_errors = []
@@ -302,7 +318,7 @@ class MetadataVerifier:
         # 2. PHI-Impact verification
         declared_phi = metadata.get('phi_impact', 'none')
         phi_ok, phi_warnings = self.analyze_phi_impact_mismatch(
-            declared_phi, files, commit_ref
+            declared_phi, files, commit_ref, file_diffs
         )
         if not phi_ok:
             all_errors.extend(phi_warnings)
@@ -313,7 +329,7 @@ class MetadataVerifier:
         # 3. HIPAA applicability
         declared_hipaa = metadata.get('hipaa', 'not applicable')
         hipaa_ok, hipaa_warnings = self.analyze_hipaa_applicability(
-            declared_hipaa, files, commit_ref
+            declared_hipaa, files, commit_ref, file_diffs
         )
         all_warnings.extend(hipaa_warnings)
         
@@ -398,7 +414,8 @@ Examples:
             'errors': result.errors,
             'recommendations': result.recommendations
         }
-        print(json.dumps(output, indent=2))
+        json.dump(output, sys.stdout, indent=2)
+        sys.stdout.write("\n")
     else:
         print("\n🔍 Metadata Verification Result")
         print("=" * 70)
@@ -23,7 +23,7 @@ import argparse
 import re
 import subprocess
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
 
 @dataclass
@@ -36,6 +36,17 @@ class RiskAssessment:
     approval_required: bool
     audit_level: str
 
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for JSON serialization (flat, no asdict deep copy)."""
+        return {
+            'score': self.score,
+            'level': self.level,
+            'reasons': list(self.reasons),
+            'deployment_strategy': self.deployment_strategy,
+            'approval_required': self.approval_required,
+            'audit_level': self.audit_level,
+        }
+
 
 class CommitRiskScorer:
     """
@@ -73,6 +84,17 @@ class CommitRiskScorer:
     
     def __init__(self):
         self.max_score = 100
+        # One alternation per tier: a single search replaces a substring test per path
+        self._high_risk_re = self._compile_paths(self.HIGH_RISK_PATHS)
+        self._medium_risk_re = self._compile_paths(self.MEDIUM_RISK_PATHS)
+        self._low_risk_re = self._compile_paths(self.LOW_RISK_PATHS)
+    
+    @staticmethod
+    def _compile_paths(paths: List[str]) -> Optional[re.Pattern]:
+        """Compile literal path fragments into one regex (None if there are none)."""
+        if not paths:
+            return None
+        return re.compile('|'.join(re.escape(p) for p in paths))
     
     def extract_metadata_from_commit(self, commit_ref: str = "HEAD") -> Dict:
         """Extract structured metadata from commit message."""
@@ -129,26 +151,16 @@ class CommitRiskScorer:
         reasons = []
         
         for file_path in files:
-            # Check high-risk paths
-            for high_risk in self.HIGH_RISK_PATHS:
-                if high_risk in file_path:
-                    score += 40
-                    reasons.append(f"High-risk path modified: {file_path}")
-                    break
-            else:
-                # Check medium-risk paths
-                for medium_risk in self.MEDIUM_RISK_PATHS:
-                    if medium_risk in file_path:
-                        score += 20
-                        reasons.append(f"Medium-risk path modified: {file_path}")
-                        break
-                else:
-                    # Check low-risk paths
-                    for low_risk in self.LOW_RISK_PATHS:
-                        if low_risk in file_path:
-                            score += 5
-                            reasons.append(f"Low-risk documentation change: {file_path}")
-                            break
+            # Tiers are checked in order; the first tier that matches wins
+            if self._high_risk_re and self._high_risk_re.search(file_path):
+                score += 40
+                reasons.append(f"High-risk path modified: {file_path}")
+            elif self._medium_risk_re and self._medium_risk_re.search(file_path):
+                score += 20
+                reasons.append(f"Medium-risk path modified: {file_path}")
+            elif self._low_risk_re and self._low_risk_re.search(file_path):
+                score += 5
+                reasons.append(f"Low-risk documentation change: {file_path}")
         
         return min(score, 40), reasons  # Cap at 40 for file paths
     
@@ -326,7 +338,8 @@ def main():
         
         # Output based on format
         if args.format == 'json':
-            print(json.dumps(asdict(assessment), indent=2))
+            json.dump(assessment.to_dict(), sys.stdout, indent=2)
+            sys.stdout.write("\n")
         
         elif args.format == 'github':
             # GitHub Actions output format
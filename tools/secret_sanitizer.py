@@ -12,12 +12,19 @@ License: MIT
 """
 
 import re
+import hashlib
 import logging
+import inspect
 import json
+import multiprocessing
+import threading
 import yaml
-from typing import List, Tuple, Dict, Optional, Pattern
-from dataclasses import dataclass
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict
+from typing import List, Tuple, Dict, FrozenSet, Iterable, Iterator, Optional, Pattern
+from dataclasses import dataclass, replace
 from enum import Enum
+from datetime import datetime, timezone
 from pathlib import Path
 from functools import lru_cache
 import os
@@ -46,7 +53,8 @@ class ProductionLogger:
         class JsonFormatter(logging.Formatter):
             def format(self, record):
                 log_data = {
-                    'timestamp': self.formatTime(record, self.datefmt),
+                    # Reuse the record's creation time instead of reading the clock again
+                    'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
                     'level': record.levelname,
                     'logger': record.name,
                     'message': record.getMessage(),
@@ -54,22 +62,39 @@ class ProductionLogger:
                     'function': record.funcName,
                     'line': record.lineno
                 }
+                context = getattr(record, 'context', None)
+                if context:
+                    log_data['context'] = context
                 if record.exc_info:
                     log_data['exception'] = self.formatException(record.exc_info)
-                return json.dumps(log_data)
+                return json.dumps(log_data, default=str)
         return JsonFormatter()
     
-    def info(self, message: str, **kwargs):
-        self.logger.info(message, extra=kwargs)
+    def _log(self, level: int, message: str, args: tuple, kwargs: Dict):
+        """Emit a record; kwargs become structured context, serialized only by the formatter"""
+        if not self.logger.isEnabledFor(level):
+            return
+        exc_info = kwargs.pop('exc_info', None)
+        self.logger.log(
+            level,
+            message,
+            *args,
+            exc_info=exc_info,
+            extra={'context': kwargs} if kwargs else None,
+            stacklevel=3  # Report the caller, not this wrapper
+        )
+    
+    def info(self, message: str, *args, **kwargs):
+        self._log(logging.INFO, message, args, kwargs)
     
-    def warning(self, message: str, **kwargs):
-        self.logger.warning(message, extra=kwargs)
+    def warning(self, message: str, *args, **kwargs):
+        self._log(logging.WARNING, message, args, kwargs)
     
-    def error(self, message: str, **kwargs):
-        self.logger.error(message, extra=kwargs)
+    def error(self, message: str, *args, **kwargs):
+        self._log(logging.ERROR, message, args, kwargs)
     
-    def debug(self, message: str, **kwargs):
-        self.logger.debug(message, extra=kwargs)
+    def debug(self, message: str, *args, **kwargs):
+        self._log(logging.DEBUG, message, args, kwargs)
 
 
 # Initialize production logger
@@ -86,7 +111,7 @@ class SecretSeverity(Enum):
     LOW = "LOW"            # Informational
 
 
-@dataclass
+@dataclass(slots=True)
 class SecretMatch:
     """Detected secret or PII with enhanced metadata"""
     pattern_name: str
@@ -97,6 +122,8 @@ class SecretMatch:
     file_path: Optional[str] = None
     is_whitelisted: bool = False
     confidence: float = 1.0  # 0.0-1.0, for false positive reduction
+    start: int = -1  # Offset of the full match in the scanned text
+    end: int = -1
     
     def to_dict(self) -> Dict:
         """Convert to dictionary for JSON serialization"""
@@ -113,10 +140,12 @@ class SecretMatch:
 
 
 # HIPAA PHI Detection Patterns (WHY: 18 HIPAA identifiers must be protected)
+# Separators are possessive (*+, ++) only where the next token cannot start
+# with a separator character, so a failed attempt never backtracks into them
 PHI_PATTERNS = {
     # Names with context
     "patient_name": (
-        r"(?i)(patient|subscriber|guarantor)[\s_-]*(name|full[\s_-]*name)[\s:=]+[A-Z][a-z]+ [A-Z][a-z]+",
+        r"(?i)(patient|subscriber|guarantor)[\s_-]*+(name|full[\s_-]*+name)[\s:=]++[A-Z][a-z]+ [A-Z][a-z]+",
         SecretSeverity.CRITICAL,
         0.9
     ),
@@ -130,28 +159,28 @@ PHI_PATTERNS = {
     
     # Medical Record Numbers (MRN)
     "mrn": (
-        r"(?i)(mrn|medical[\s_-]*record[\s_-]*number|patient[\s_-]*id)[\s:=]+[A-Z0-9]{6,12}",
+        r"(?i)(mrn|medical[\s_-]*+record[\s_-]*+number|patient[\s_-]*+id)[\s:=]++[A-Z0-9]{6,12}",
         SecretSeverity.CRITICAL,
         0.95
     ),
     
     # Date of Birth patterns
     "dob": (
-        r"(?i)(dob|date[\s_-]*of[\s_-]*birth|birthdate)[\s:=]+\d{1,2}[/-]\d{1,2}[/-]\d{2,4}",
+        r"(?i)(dob|date[\s_-]*+of[\s_-]*+birth|birthdate)[\s:=]++\d{1,2}[/-]\d{1,2}[/-]\d{2,4}",
         SecretSeverity.CRITICAL,
         0.9
     ),
     
     # Email addresses (potential PHI in healthcare context)
     "email_phi": (
-        r"(?i)(patient|subscriber)[\s_-]*email[\s:=]+[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
+        r"(?i)(patient|subscriber)[\s_-]*+email[\s:=]++[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}",
         SecretSeverity.HIGH,
         0.8
     ),
     
     # Phone numbers (potential PHI)
     "phone": (
-        r"(?i)(patient|subscriber|emergency)[\s_-]*(phone|tel|mobile)[\s:=]+\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}",
+        r"(?i)(patient|subscriber|emergency)[\s_-]*+(phone|tel|mobile)[\s:=]++\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}",
         SecretSeverity.HIGH,
         0.85
     ),
@@ -175,19 +204,19 @@ PHI_PATTERNS = {
 # API Keys and Credentials (WHY: prevent credential leakage to public LLMs)
 CREDENTIAL_PATTERNS = {
     "aws_access_key": (
-        r"(?i)(aws|amazon)[\s_-]*(access[\s_-]*key|key[\s_-]*id)[\s:=]+[A-Z0-9]{20}",
+        r"(?i)(aws|amazon)[\s_-]*+(access[\s_-]*+key|key[\s_-]*+id)[\s:=]++[A-Z0-9]{20}",
         SecretSeverity.CRITICAL,
         0.95
     ),
     
     "aws_secret": (
-        r"(?i)(aws|amazon)[\s_-]*secret[\s:=]+[A-Za-z0-9/+=]{40}",
+        r"(?i)(aws|amazon)[\s_-]*+secret[\s:=]+[A-Za-z0-9/+=]{40}",
         SecretSeverity.CRITICAL,
         0.95
     ),
     
     "azure_key": (
-        r"(?i)azure[\s_-]*(key|secret|password)[\s:=]+[A-Za-z0-9/+=]{32,}",
+        r"(?i)azure[\s_-]*+(key|secret|password)[\s:=]+[A-Za-z0-9/+=]{32,}",
         SecretSeverity.CRITICAL,
         0.9
     ),
@@ -205,19 +234,23 @@ CREDENTIAL_PATTERNS = {
     ),
     
     "generic_api_key": (
-        r"(?i)(api|private)[\s_-]*(key|token|secret)[\s:=]+['\"]?[A-Za-z0-9/+=_-]{32,}['\"]?",
+        r"(?i)(api|private)[\s_-]*+(key|token|secret)[\s:=]+['\"]?[A-Za-z0-9/+=_-]{32,}+['\"]?",
         SecretSeverity.HIGH,
         0.7  # High false positives
     ),
     
+    # Starts only where a base64url run starts (WHY: a long run of "eyJ"
+    # repeats otherwise retries the rescan from every occurrence: quadratic)
     "jwt_token": (
-        r"eyJ[A-Za-z0-9_-]+\.eyJ[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+",
+        r"(?<![A-Za-z0-9_-])eyJ[A-Za-z0-9_-]++\.eyJ[A-Za-z0-9_-]++\.[A-Za-z0-9_-]+",
         SecretSeverity.HIGH,
         0.95
     ),
     
+    # Password searched for within 512 characters of the key (WHY: an
+    # unbounded .* rescans the rest of the line from every "conn str" prefix)
     "connection_string": (
-        r"(?i)(connection[\s_-]*string|conn[\s_-]*str)[\s:=]+.*(password|pwd)=[^;\s]+",
+        r"(?i)(connection[\s_-]*+string|conn[\s_-]*+str)[\s:=]+.{0,512}(password|pwd)=[^;\s]+",
         SecretSeverity.CRITICAL,
         0.95
     ),
@@ -230,6 +263,39 @@ CREDENTIAL_PATTERNS = {
 }
 
 
+# Literals every match of a built-in pattern must contain, lowercased
+# (WHY: a substring check rules most patterns out of clean text far faster
+# than running the regex; patterns without an entry are always run)
+PATTERN_LITERAL_HINTS: Dict[str, Tuple[str, ...]] = {
+    "patient_name": ("patient", "subscriber", "guarantor"),
+    "mrn": ("mrn", "medical", "patient"),
+    "dob": ("dob", "birth"),
+    "email_phi": ("patient", "subscriber"),
+    "phone": ("patient", "subscriber", "emergency"),
+    "aws_access_key": ("aws", "amazon"),
+    "aws_secret": ("aws", "amazon"),
+    "azure_key": ("azure",),
+    "github_token": ("ghp_", "gho_", "ghu_", "ghs_", "ghr_"),
+    "openai_key": ("sk-",),
+    "generic_api_key": ("api", "private"),
+    "jwt_token": ("eyj",),
+    "connection_string": ("conn",),
+    "private_key_header": ("-----begin",),
+}
+
+# Built-in detectors for digit runs, searched for together: one joined search
+# finds every line any of them can match on (WHY: about twice as fast as three
+# separate whole-text searches, and digits are everywhere in code diffs)
+NUMERIC_PII_PATTERNS = ("ssn", "credit_card", "ip_address")
+NUMERIC_PII_REGEX = re.compile(
+    "|".join(f"(?:{PHI_PATTERNS[name][0]})" for name in NUMERIC_PII_PATTERNS)
+)
+
+# Characters (?i) matches against ASCII letters that str.lower() does not map
+# to them, applied before lowercasing ('İ'.lower() is 'i' plus a combining dot)
+_CASE_FOLD_FIXES = {0x130: "i", 0x131: "i", 0x17F: "s"}  # dotted/dotless i, long s
+
+
 # Sensitive File Patterns (WHY: files that should never be processed by AI)
 SENSITIVE_FILE_PATTERNS = [
     r"\.env$",
@@ -247,6 +313,66 @@ SENSITIVE_FILE_PATTERNS = [
     r"service-account.*\.json$",
 ]
 
+# Compiled once at import (WHY: is_sensitive_file runs for every file in a diff)
+SENSITIVE_FILE_REGEXES: List[Pattern] = [
+    re.compile(p, re.IGNORECASE) for p in SENSITIVE_FILE_PATTERNS
+]
+
+# All sensitive file patterns in one search; the individual regexes above are
+# only consulted to name the matching pattern
+SENSITIVE_FILE_REGEX = re.compile(
+    "|".join(f"(?:{p})" for p in SENSITIVE_FILE_PATTERNS), re.IGNORECASE
+)
+
+# Version numbers look like IPs: 1.2.3.4
+VERSION_NUMBER_PATTERN = re.compile(r"^\d\.\d+\.\d+\.\d+$")
+
+
+@lru_cache(maxsize=512)
+def _compile_pattern(pattern: str, flags: int = 0) -> Pattern:
+    """
+    Compile a detection/whitelist regex once per process
+    
+    WHY: every SecretSanitizer compiles the same built-in patterns; sharing
+    the compiled objects makes constructing additional instances cheap.
+    """
+    return re.compile(pattern, flags)
+
+
+# Severities that block AI processing in validate_for_ai_processing
+BLOCKING_SEVERITIES: FrozenSet[SecretSeverity] = frozenset(
+    (SecretSeverity.CRITICAL, SecretSeverity.HIGH)
+)
+
+# Number of distinct scan results kept per sanitizer when caching is enabled
+SCAN_CACHE_SIZE = 128
+
+# Line boundaries recognised by str.splitlines()
+_LINE_BREAK = re.compile(r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+# Regex syntax whose result depends on where the scanned string starts or ends
+# (anchors, lookarounds); patterns using it are always matched line by line
+_LINE_CONTEXT_SYNTAX = re.compile(r"(?<!(?<!\\)\[)\^|\$|\\[AZ]|\(\?<?[=!]")
+
+
+def _touched_lines(pattern: Pattern, text: str, line_starts: List[int]) -> List[int]:
+    """
+    Indexes of the lines spanned by matches of a whole-text search
+    
+    WHY: one finditer over the whole text stays inside the regex engine; any
+    line where the pattern matches on its own is touched by one of these
+    spans (for patterns free of _LINE_CONTEXT_SYNTAX), so only those lines
+    need the exact per-line scan.
+    """
+    touched: List[int] = []
+    for match in pattern.finditer(text):
+        first = bisect_right(line_starts, match.start()) - 1
+        last = bisect_right(line_starts, max(match.end() - 1, match.start())) - 1
+        if touched and first <= touched[-1]:
+            first = touched[-1] + 1
+        touched.extend(range(first, last + 1))
+    return touched
+
 
 # Whitelists for False Positive Reduction
 DEFAULT_WHITELISTS = {
@@ -347,11 +473,34 @@ class SecretSanitizer:
         self.compiled_patterns: Dict[str, Tuple[Pattern, SecretSeverity, float]] = {}
         for name, (pattern, severity, confidence) in self.patterns.items():
             try:
-                self.compiled_patterns[name] = (re.compile(pattern), severity, confidence)
+                self.compiled_patterns[name] = (_compile_pattern(pattern), severity, confidence)
             except re.error as e:
-                logger.error(f"Failed to compile pattern '{name}': {e}")
+                logger.error("Failed to compile pattern '%s': %s", name, e)
         
-        logger.info(f"Compiled {len(self.compiled_patterns)} detection patterns")
+        logger.info("Compiled %d detection patterns", len(self.compiled_patterns))
+        
+        # Literal prefilters, only for built-in patterns that were not overridden
+        builtin_patterns = {**PHI_PATTERNS, **CREDENTIAL_PATTERNS}
+        self._literal_hints: Dict[str, Tuple[str, ...]] = {
+            name: PATTERN_LITERAL_HINTS[name]
+            for name in self.compiled_patterns
+            if name in PATTERN_LITERAL_HINTS
+            and name in builtin_patterns
+            and self.patterns[name][0] == builtin_patterns[name][0]
+        }
+        
+        # Digit-run detectors located through NUMERIC_PII_REGEX (unless overridden)
+        self._numeric_pii_patterns = frozenset(
+            name for name in NUMERIC_PII_PATTERNS
+            if name in self.compiled_patterns
+            and self.patterns[name][0] == PHI_PATTERNS[name][0]
+        )
+        
+        # Patterns that cannot be located with a whole-text search first
+        self._line_context_patterns = frozenset(
+            name for name in self.compiled_patterns
+            if _LINE_CONTEXT_SYNTAX.search(self.patterns[name][0])
+        )
         
         # Load whitelists
         self.whitelists = DEFAULT_WHITELISTS.copy()
@@ -363,14 +512,31 @@ class SecretSanitizer:
         self.compiled_whitelists: Dict[str, List[Pattern]] = {}
         for category, patterns in self.whitelists.items():
             self.compiled_whitelists[category] = [
-                re.compile(p, re.IGNORECASE) for p in patterns
+                _compile_pattern(p, re.IGNORECASE) for p in patterns
             ]
         
-        logger.info(f"Loaded {sum(len(v) for v in self.whitelists.values())} whitelist patterns")
+        logger.info("Loaded %d whitelist patterns", sum(len(v) for v in self.whitelists.values()))
         
         # Performance tracking
         self.scan_count = 0
         self.cache_hits = 0
+        
+        # Scan results keyed by content digest (WHY: the same diff is often
+        # validated, reported on and sanitized in one run). The lock makes
+        # lookup/reorder and insert/evict atomic for the shared instance
+        # used by safe_ai_processing across threads.
+        self._scan_cache: "OrderedDict[Tuple[bytes, Optional[str], bool], List[SecretMatch]]" = OrderedDict()
+        self._scan_cache_lock = threading.Lock()
+    
+    def __getstate__(self) -> Dict:
+        # Locks cannot be pickled (scan_files ships the sanitizer to workers)
+        state = self.__dict__.copy()
+        del state["_scan_cache_lock"]
+        return state
+    
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._scan_cache_lock = threading.Lock()
     
     def _load_config(self, config_file: Optional[str]) -> Dict:
         """Load configuration from file"""
@@ -425,10 +591,13 @@ class SecretSanitizer:
         if self._is_whitelisted(file_path, "safe_files"):
             return False, "Whitelisted as safe file"
         
-        # Check sensitive patterns
-        for pattern in SENSITIVE_FILE_PATTERNS:
-            if re.search(pattern, file_path, re.IGNORECASE):
-                return True, f"Matches sensitive file pattern: {pattern}"
+        # Check sensitive patterns (one combined search rules out most paths)
+        if not SENSITIVE_FILE_REGEX.search(file_path):
+            return False, "Not sensitive"
+        
+        for pattern in SENSITIVE_FILE_REGEXES:
+            if pattern.search(file_path):
+                return True, f"Matches sensitive file pattern: {pattern.pattern}"
         
         return False, "Not sensitive"
     
@@ -450,11 +619,90 @@ class SecretSanitizer:
             List of detected secrets/PII
         """
         self.scan_count += 1
-        matches = []
+        
+        cache_key = None
+        if self.enable_cache:
+            digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+            cache_key = (digest, file_path, apply_whitelist)
+            with self._scan_cache_lock:
+                cached = self._scan_cache.get(cache_key)
+                if cached is not None:
+                    self._scan_cache.move_to_end(cache_key)
+                    self.cache_hits += 1
+            if cached is not None:
+                # Copies, so callers cannot change what later hits return
+                return [replace(m) for m in cached]
+        
+        matches = list(self.iter_matches(text, file_path, apply_whitelist))
+        
+        logger.debug("Scan complete: %d matches found", len(matches))
+        
+        if cache_key is not None:
+            cached = [replace(m) for m in matches]
+            with self._scan_cache_lock:
+                self._scan_cache[cache_key] = cached
+                if len(self._scan_cache) > SCAN_CACHE_SIZE:
+                    self._scan_cache.popitem(last=False)
+        
+        return matches
+    
+    def iter_matches(
+        self,
+        text: str,
+        file_path: Optional[str] = None,
+        apply_whitelist: bool = True,
+        severities: Optional[FrozenSet[SecretSeverity]] = None
+    ) -> Iterator[SecretMatch]:
+        """
+        Lazily scan text for secrets and PII, pattern by pattern
+        
+        Yields the same matches as scan_text, in the same order, without
+        building the list or touching the scan cache; stop iterating as soon
+        as the answer is known (e.g. "does this contain any secret?").
+        
+        Args:
+            text: Text to scan
+            file_path: Optional file path for context
+            apply_whitelist: Apply whitelist for false positive reduction
+            severities: Only run patterns of these severities (default: all)
+        """
         lines = text.splitlines()
+        line_starts = [0]
+        line_starts.extend(m.end() for m in _LINE_BREAK.finditer(text))
+        
+        # Lowercased once for the literal prefilters
+        folded = text if text.isascii() else text.translate(_CASE_FOLD_FIXES)
+        folded = folded.lower()
+        
+        numeric_lines = None
         
         for pattern_name, (pattern, severity, base_confidence) in self.compiled_patterns.items():
-            for line_num, line in enumerate(lines, 1):
+            if severities is not None and severity not in severities:
+                continue
+            
+            hints = self._literal_hints.get(pattern_name)
+            if hints and not any(hint in folded for hint in hints):
+                continue  # No match possible without one of its literals
+            
+            # Search the whole text once; re-match only the lines it touched
+            # so line numbers, context and overlaps stay exactly per-line
+            candidates: Iterable[int]
+            if pattern_name in self._line_context_patterns:
+                candidates = range(len(lines))
+            elif pattern_name in self._numeric_pii_patterns:
+                if numeric_lines is None:
+                    numeric_lines = _touched_lines(NUMERIC_PII_REGEX, text, line_starts)
+                candidates = numeric_lines
+            else:
+                candidates = _touched_lines(pattern, text, line_starts)
+            
+            for index in candidates:
+                if index >= len(lines):
+                    break
+                line = lines[index]
+                line_num = index + 1
+                line_offset = line_starts[index]
+                line_lower = None  # Lowercased on demand, at most once per line
                 for match in pattern.finditer(line):
                     matched_text = match.group(0)
                     
@@ -475,18 +723,20 @@ class SecretSanitizer:
                         
                         # Additional heuristics for false positive reduction
                         if "ip_address" in pattern_name:
-                            # Version numbers look like IPs: 1.2.3.4
-                            if re.match(r"^\d\.\d+\.\d+\.\d+$", matched_text):
+                            if VERSION_NUMBER_PATTERN.match(matched_text):
                                 confidence *= 0.3  # Likely version number
                         
                         if "credit_card" in pattern_name:
                             # Reduce confidence for numbers with dashes in code
-                            if "-" in line and ("version" in line.lower() or "id" in line.lower()):
-                                confidence *= 0.5
+                            if "-" in line:
+                                if line_lower is None:
+                                    line_lower = line.lower()
+                                if "version" in line_lower or "id" in line_lower:
+                                    confidence *= 0.5
                     
                     # Only report if confidence exceeds threshold
                     if confidence >= self.confidence_threshold or not apply_whitelist:
-                        matches.append(SecretMatch(
+                        yield SecretMatch(
                             pattern_name=pattern_name,
                             severity=severity,
                             matched_text=matched_text[:50],  # Truncate for logging
@@ -494,11 +744,62 @@ class SecretSanitizer:
                             context=line[:100],  # Context for debugging
                             file_path=file_path,
                             is_whitelisted=is_whitelisted,
-                            confidence=confidence
-                        ))
+                            confidence=confidence,
+                            start=line_offset + match.start(),
+                            end=line_offset + match.end()
+                        )
+    
+    def scan_file(
+        self,
+        file_path: str,
+        apply_whitelist: bool = True
+    ) -> List[SecretMatch]:
+        """
+        Read a file and scan its contents
         
-        logger.debug(f"Scan complete: {len(matches)} matches found")
-        return matches
+        Returns:
+            List of detected secrets/PII
+        
+        Raises:
+            OSError: If the file cannot be read (WHY: an unread file must
+                not be reported as clean by a safety gate)
+        """
+        text = Path(file_path).read_text(encoding="utf-8", errors="replace")
+        return self.scan_text(text, file_path, apply_whitelist)
+    
+    def scan_files(
+        self,
+        file_paths: List[str],
+        num_processors: Optional[int] = None
+    ) -> Dict[str, List[SecretMatch]]:
+        """
+        Scan many files, fanning out across worker processes
+        
+        WHY: files are scanned independently and the work is pure regex CPU,
+        so batch scans (whole repositories, large changesets) scale with cores.
+        
+        Args:
+            file_paths: Files to scan
+            num_processors: Worker processes (default: CPU count); 1 scans in-process
+        
+        Returns:
+            Detected secrets/PII per file, in input order
+        
+        Raises:
+            OSError: If any file cannot be read, from the worker that read it
+        """
+        paths = list(dict.fromkeys(file_paths))
+        processes = min(num_processors or os.cpu_count() or 1, len(paths))
+        if processes <= 1:
+            return {path: self.scan_file(path) for path in paths}
+        
+        # Each worker gets a copy of this sanitizer once, not once per file
+        chunksize = max(1, len(paths) // (processes * 4))
+        with multiprocessing.Pool(processes, _init_scan_worker, (self,)) as pool:
+            results = dict(pool.imap(_scan_file_in_worker, paths, chunksize))
+        
+        self.scan_count += len(paths)
+        return results
     
     def sanitize_text(
         self,
@@ -516,43 +817,57 @@ class SecretSanitizer:
             (sanitized_text, detected_secrets)
         """
         matches = self.scan_text(text, apply_whitelist=False)
-        sanitized = text
         
-        # Sort matches by position (reverse) to maintain string indices
-        sorted_matches = sorted(
-            matches,
-            key=lambda m: text.find(m.matched_text),
-            reverse=True
+        # Redact the detected spans in one left-to-right pass (WHY: replacing
+        # matched_text by value hit the first occurrence, not the detected one,
+        # and missed the tail of matches truncated for logging). Overlapping
+        # detections, e.g. an SSN inside a card number, become one redaction.
+        spans = sorted(
+            (m for m in matches if not m.is_whitelisted and m.end > m.start),
+            key=lambda m: (m.start, -m.end)
         )
-        
-        for match in sorted_matches:
-            if match.is_whitelisted:
-                continue  # Skip whitelisted items
+        parts = []
+        position = 0
+        i = 0
+        while i < len(spans):
+            match = spans[i]
+            start, end = match.start, match.end
+            i += 1
+            while i < len(spans) and spans[i].start < end:
+                end = max(end, spans[i].end)
+                i += 1
+            secret = text[start:end]
             
             # Choose redaction based on mode
             if redaction_mode == "replace":
                 redaction = f"[REDACTED_{match.pattern_name.upper()}]"
             elif redaction_mode == "mask":
                 # Mask: keep first/last char, mask middle
-                if len(match.matched_text) > 4:
-                    redaction = match.matched_text[0] + "█" * (len(match.matched_text) - 2) + match.matched_text[-1]
+                if len(secret) > 4:
+                    redaction = secret[0] + "█" * (len(secret) - 2) + secret[-1]
                 else:
-                    redaction = "█" * len(match.matched_text)
+                    redaction = "█" * len(secret)
             elif redaction_mode == "remove":
                 redaction = ""
             else:
                 redaction = "[REDACTED]"
             
-            sanitized = sanitized.replace(match.matched_text, redaction, 1)
+            parts.append(text[position:start])
+            parts.append(redaction)
+            position = end
+        
+        parts.append(text[position:])
+        sanitized = "".join(parts)
         
-        logger.info(f"Sanitized {len([m for m in matches if not m.is_whitelisted])} secrets")
+        logger.info("Sanitized %d secrets", sum(1 for m in matches if not m.is_whitelisted))
         return sanitized, matches
     
     def validate_for_ai_processing(
         self,
         text: str,
         file_path: Optional[str] = None,
-        block_on_detection: bool = True
+        block_on_detection: bool = True,
+        fail_fast: bool = False
     ) -> Tuple[bool, List[SecretMatch]]:
         """
         Validate if text is safe for AI processing
@@ -561,6 +876,8 @@ class SecretSanitizer:
             text: Text to validate
             file_path: Optional file path
             block_on_detection: Block if secrets detected (vs warn)
+            fail_fast: When blocking, stop at the first critical/high secret
+                and return only that match instead of a full report
         
         Returns:
             (is_safe, detected_secrets)
@@ -569,11 +886,21 @@ class SecretSanitizer:
         if file_path:
             is_sensitive, reason = self.is_sensitive_file(file_path)
             if is_sensitive:
-                logger.error(f"Sensitive file detected: {file_path} - {reason}")
+                logger.error("Sensitive file detected: %s - %s", file_path, reason)
                 return False, []
         
         # Scan for secrets
-        matches = self.scan_text(text, file_path, apply_whitelist=True)
+        if fail_fast and block_on_detection:
+            blocking, matches = self._scan_until_blocking(text, file_path)
+            if blocking is not None:
+                logger.error(
+                    "Found %s secret %s at line %d (confidence: %.2f), stopped scanning",
+                    blocking.severity.value, blocking.pattern_name,
+                    blocking.line_number, blocking.confidence
+                )
+                return False, [blocking]
+        else:
+            matches = self.scan_text(text, file_path, apply_whitelist=True)
         
         # Filter out whitelisted and low-confidence matches
         significant_matches = [
@@ -584,18 +911,18 @@ class SecretSanitizer:
         # Check for critical/high severity secrets
         critical_matches = [
             m for m in significant_matches
-            if m.severity in [SecretSeverity.CRITICAL, SecretSeverity.HIGH]
+            if m.severity in BLOCKING_SEVERITIES
         ]
         
         if critical_matches:
             logger.error(
-                f"Found {len(critical_matches)} critical/high severity secrets "
-                f"(total: {len(matches)}, whitelisted: {len([m for m in matches if m.is_whitelisted])})"
+                "Found %d critical/high severity secrets (total: %d, whitelisted: %d)",
+                len(critical_matches), len(matches), sum(1 for m in matches if m.is_whitelisted)
             )
             for match in critical_matches[:5]:  # Log first 5
                 logger.error(
-                    f"  {match.severity.value}: {match.pattern_name} "
-                    f"at line {match.line_number} (confidence: {match.confidence:.2f})"
+                    "  %s: %s at line %d (confidence: %.2f)",
+                    match.severity.value, match.pattern_name, match.line_number, match.confidence
                 )
             
             if block_on_detection:
@@ -610,12 +937,40 @@ class SecretSanitizer:
         ]
         if medium_matches:
             logger.warning(
-                f"Found {len(medium_matches)} medium severity patterns "
-                f"(proceeding with caution)"
+                "Found %d medium severity patterns (proceeding with caution)",
+                len(medium_matches)
             )
         
         return True, matches
     
+    def _scan_until_blocking(
+        self,
+        text: str,
+        file_path: Optional[str]
+    ) -> Tuple[Optional[SecretMatch], List[SecretMatch]]:
+        """
+        Scan critical/high patterns first and stop at the first significant hit
+        
+        Returns:
+            (blocking match or None, all matches when nothing blocks, in the
+            same order scan_text would return them)
+        """
+        self.scan_count += 1
+        
+        matches = []
+        for match in self.iter_matches(text, file_path, True, BLOCKING_SEVERITIES):
+            if not match.is_whitelisted and match.confidence >= self.confidence_threshold:
+                return match, []
+            matches.append(match)
+        
+        # Nothing blocks: finish with the remaining severities (WHY: the
+        # critical/high pass is not repeated for the caller's warnings)
+        remaining = frozenset(SecretSeverity) - BLOCKING_SEVERITIES
+        matches.extend(self.iter_matches(text, file_path, True, remaining))
+        order = {name: i for i, name in enumerate(self.compiled_patterns)}
+        matches.sort(key=lambda m: order[m.pattern_name])
+        return None, matches
+    
     def generate_safety_report(
         self,
         matches: List[SecretMatch],
@@ -653,49 +1008,59 @@ class SecretSanitizer:
         significant = [m for m in matches if not m.is_whitelisted]
         whitelisted = [m for m in matches if m.is_whitelisted]
         
-        report = "⚠️  SECURITY SCAN RESULTS\n\n"
-        report += f"Total Matches: {len(matches)}\n"
-        report += f"Significant: {len(significant)}\n"
-        report += f"Whitelisted (safe): {len(whitelisted)}\n\n"
+        by_severity: Dict[SecretSeverity, List[SecretMatch]] = defaultdict(list)
+        for match in significant:
+            by_severity[match.severity].append(match)
         
-        if significant:
-            # Group by severity
-            by_severity = {}
-            for match in significant:
-                by_severity.setdefault(match.severity, []).append(match)
-            
-            for severity in [SecretSeverity.CRITICAL, SecretSeverity.HIGH, SecretSeverity.MEDIUM, SecretSeverity.LOW]:
-                if severity in by_severity:
-                    report += f"\n{severity.value} ({len(by_severity[severity])} matches):\n"
-                    for match in by_severity[severity][:10]:  # Limit to 10
-                        report += f"  - {match.pattern_name} at line {match.line_number} "
-                        report += f"(confidence: {match.confidence:.2f})\n"
-                        if match.file_path:
-                            report += f"    File: {match.file_path}\n"
-                    
-                    if len(by_severity[severity]) > 10:
-                        report += f"  ... and {len(by_severity[severity]) - 10} more\n"
+        # Collect report parts and join once (WHY: repeated += copies the whole report)
+        parts = [
+            "⚠️  SECURITY SCAN RESULTS\n\n",
+            f"Total Matches: {len(matches)}\n",
+            f"Significant: {len(significant)}\n",
+            f"Whitelisted (safe): {len(whitelisted)}\n\n",
+        ]
+        
+        for severity in [SecretSeverity.CRITICAL, SecretSeverity.HIGH, SecretSeverity.MEDIUM, SecretSeverity.LOW]:
+            if severity in by_severity:
+                group = by_severity[severity]
+                parts.append(f"\n{severity.value} ({len(group)} matches):\n")
+                for match in group[:10]:  # Limit to 10
+                    parts.append(
+                        f"  - {match.pattern_name} at line {match.line_number} "
+                        f"(confidence: {match.confidence:.2f})\n"
+                    )
+                    if match.file_path:
+                        parts.append(f"    File: {match.file_path}\n")
+                
+                if len(group) > 10:
+                    parts.append(f"  ... and {len(group) - 10} more\n")
         
         # Recommendations
-        report += "\n📋 RECOMMENDATIONS:\n"
-        critical = [m for m in significant if m.severity == SecretSeverity.CRITICAL]
-        high = [m for m in significant if m.severity == SecretSeverity.HIGH]
+        parts.append("\n📋 RECOMMENDATIONS:\n")
+        critical = by_severity.get(SecretSeverity.CRITICAL, [])
+        high = by_severity.get(SecretSeverity.HIGH, [])
         
         if critical:
-            report += f"  ❌ BLOCK AI PROCESSING - {len(critical)} critical secrets detected\n"
-            report += "  1. Remove secrets from code\n"
-            report += "  2. Rotate compromised credentials immediately\n"
-            report += "  3. Use environment variables or secret managers\n"
+            parts.extend((
+                f"  ❌ BLOCK AI PROCESSING - {len(critical)} critical secrets detected\n",
+                "  1. Remove secrets from code\n",
+                "  2. Rotate compromised credentials immediately\n",
+                "  3. Use environment variables or secret managers\n",
+            ))
         elif high:
-            report += f"  ⚠️  CAUTION - {len(high)} high severity items detected\n"
-            report += "  1. Review if PII is necessary in code\n"
-            report += "  2. Consider using synthetic test data\n"
-            report += "  3. Enable redaction mode for AI processing\n"
+            parts.extend((
+                f"  ⚠️  CAUTION - {len(high)} high severity items detected\n",
+                "  1. Review if PII is necessary in code\n",
+                "  2. Consider using synthetic test data\n",
+                "  3. Enable redaction mode for AI processing\n",
+            ))
         else:
-            report += "  ℹ️  PROCEED WITH CAUTION - Medium/low severity patterns\n"
-            report += "  Most patterns are whitelisted or low confidence\n"
+            parts.extend((
+                "  ℹ️  PROCEED WITH CAUTION - Medium/low severity patterns\n",
+                "  Most patterns are whitelisted or low confidence\n",
+            ))
         
-        return report
+        return "".join(parts)
     
     def get_performance_stats(self) -> Dict:
         """Get performance statistics"""
@@ -708,30 +1073,101 @@ class SecretSanitizer:
         }
 
 
+# Sanitizer used by scan_files worker processes (set by _init_scan_worker)
+_WORKER_SANITIZER: Optional[SecretSanitizer] = None
+
+
+def _init_scan_worker(sanitizer: SecretSanitizer) -> None:
+    global _WORKER_SANITIZER
+    _WORKER_SANITIZER = sanitizer
+
+
+def _scan_file_in_worker(file_path: str) -> Tuple[str, List[SecretMatch]]:
+    return file_path, _WORKER_SANITIZER.scan_file(file_path)
+
+
+# Parameter names safe_ai_processing treats as the AI payload
+TEXT_PARAMETER_NAMES = ("text", "diff", "content")
+
+# Sanitizer shared by all safe_ai_processing calls (created on first use)
+_DEFAULT_SANITIZER: Optional[SecretSanitizer] = None
+
+
+def _get_default_sanitizer() -> SecretSanitizer:
+    """
+    Return the shared sanitizer for decorated AI calls
+    
+    WHY: construction reads the config file and builds the pattern and
+    whitelist tables; one instance also keeps its scan cache across calls.
+    """
+    global _DEFAULT_SANITIZER
+    if _DEFAULT_SANITIZER is None:
+        _DEFAULT_SANITIZER = SecretSanitizer(
+            enable_cache=True,
+            confidence_threshold=0.7
+        )
+    return _DEFAULT_SANITIZER
+
+
 # Integration wrapper for healthcare tools
 def safe_ai_processing(func):
     """
     Decorator to add secret sanitization to AI processing functions
     WHY: Automatic protection for all AI workflows
+    
+    The payload is the parameter named in TEXT_PARAMETER_NAMES, located once
+    from the signature; functions without one fall back to the first long
+    string argument or a 'text' keyword.
+    
+    Environment:
+        GITOPS_SAFETY_BLOCK_ON_DETECTION: 'true' (default) raises on
+            critical/high findings; 'false' only logs them. Read per call.
+        GITOPS_SAFETY_DISABLED: 'true' turns the gate off entirely. Read at
+            decoration time: the function is returned unwrapped and a
+            warning is logged for it.
     """
+    if os.getenv("GITOPS_SAFETY_DISABLED", "false").lower() == "true":
+        logger.warning(
+            "GITOPS_SAFETY_DISABLED is set: %s.%s will send input to AI without secret/PHI scanning",
+            func.__module__, func.__qualname__
+        )
+        return func
+    
+    try:
+        parameters = list(inspect.signature(func).parameters.values())
+    except (TypeError, ValueError):  # Signature not introspectable
+        parameters = []
+    text_param = next((p for p in parameters if p.name in TEXT_PARAMETER_NAMES), None)
+    
+    if text_param is None:
+        def extract_text(args, kwargs):
+            for arg in args:
+                if isinstance(arg, str) and len(arg) > 100:  # Likely the text payload
+                    return arg
+            return kwargs.get('text')
+    elif text_param.kind in (
+        inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD
+    ):
+        text_index = parameters.index(text_param)
+        text_name = text_param.name
+        
+        def extract_text(args, kwargs):
+            text_input = args[text_index] if text_index < len(args) else kwargs.get(text_name)
+            return text_input if isinstance(text_input, str) else None
+    else:
+        text_name = text_param.name
+        
+        def extract_text(args, kwargs):
+            text_input = kwargs.get(text_name)
+            return text_input if isinstance(text_input, str) else None
+    
     def wrapper(*args, **kwargs):
         # Get configuration
         block_on_detection = os.getenv("GITOPS_SAFETY_BLOCK_ON_DETECTION", "true").lower() == "true"
         
-        sanitizer = SecretSanitizer(
-            enable_cache=True,
-            confidence_threshold=0.7
-        )
-        
-        # Extract text input (assuming first string arg or 'text' kwarg)
-        text_input = None
-        for arg in args:
-            if isinstance(arg, str) and len(arg) > 100:  # Likely the text payload
-                text_input = arg
-                break
+        sanitizer = _get_default_sanitizer()
         
-        if not text_input and 'text' in kwargs:
-            text_input = kwargs['text']
+        text_input = extract_text(args, kwargs)
         
         if text_input:
             is_safe, matches = sanitizer.validate_for_ai_processing(
@@ -748,9 +1184,8 @@ def safe_ai_processing(func):
             
             if matches:
                 logger.warning(
-                    f"Detected {len(matches)} potential secrets "
-                    f"({len([m for m in matches if not m.is_whitelisted])} significant, "
-                    f"proceeding with caution)"
+                    "Detected %d potential secrets (%d significant, proceeding with caution)",
+                    len(matches), sum(1 for m in matches if not m.is_whitelisted)
                 )
         
         return func(*args, **kwargs)
@@ -19,6 +19,7 @@ import time
 from typing import Tuple, Optional, List, Dict, Any
 from dataclasses import dataclass
 from enum import Enum
+from datetime import datetime, timezone
 from pathlib import Path
 import os
 import re
@@ -47,7 +48,8 @@ class ProductionLogger:
         class JsonFormatter(logging.Formatter):
             def format(self, record):
                 log_data = {
-                    'timestamp': self.formatTime(record, self.datefmt),
+                    # Reuse the record's creation time instead of reading the clock again
+                    'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
                     'level': record.levelname,
                     'logger': record.name,
                     'message': record.getMessage(),
@@ -55,22 +57,39 @@ class ProductionLogger:
                     'function': record.funcName,
                     'line': record.lineno
                 }
+                context = getattr(record, 'context', None)
+                if context:
+                    log_data['context'] = context
                 if record.exc_info:
                     log_data['exception'] = self.formatException(record.exc_info)
-                return json.dumps(log_data)
+                return json.dumps(log_data, default=str)
         return JsonFormatter()
     
-    def info(self, message: str, **kwargs):
-        self.logger.info(message, extra=kwargs)
+    def _log(self, level: int, message: str, args: tuple, kwargs: Dict):
+        """Emit a record; kwargs become structured context, serialized only by the formatter"""
+        if not self.logger.isEnabledFor(level):
+            return
+        exc_info = kwargs.pop('exc_info', None)
+        self.logger.log(
+            level,
+            message,
+            *args,
+            exc_info=exc_info,
+            extra={'context': kwargs} if kwargs else None,
+            stacklevel=3  # Report the caller, not this wrapper
+        )
+    
+    def info(self, message: str, *args, **kwargs):
+        self._log(logging.INFO, message, args, kwargs)
     
-    def warning(self, message: str, **kwargs):
-        self.logger.warning(message, extra=kwargs)
+    def warning(self, message: str, *args, **kwargs):
+        self._log(logging.WARNING, message, args, kwargs)
     
-    def error(self, message: str, **kwargs):
-        self.logger.error(message, extra=kwargs)
+    def error(self, message: str, *args, **kwargs):
+        self._log(logging.ERROR, message, args, kwargs)
     
-    def debug(self, message: str, **kwargs):
-        self.logger.debug(message, extra=kwargs)
+    def debug(self, message: str, *args, **kwargs):
+        self._log(logging.DEBUG, message, args, kwargs)
 
 
 # Initialize production logger
@@ -135,6 +154,17 @@ MODEL_CAPABILITIES = {
 }
 
 
+# Pricing per 1M tokens (as of 2025)
+MODEL_PRICING = {
+    "gpt-4": {"input": 30.0, "output": 60.0},
+    "gpt-4-turbo": {"input": 10.0, "output": 30.0},
+    "gpt-3.5-turbo": {"input": 0.5, "output": 1.5},
+    "claude-3-opus": {"input": 15.0, "output": 75.0},
+    "claude-3-sonnet": {"input": 3.0, "output": 15.0},
+    "default": {"input": 10.0, "output": 30.0}
+}
+
+
 class TokenLimitGuard:
     """
     Production-ready token limit guard with dynamic thresholds
@@ -653,18 +683,7 @@ class TokenLimitGuard:
             Dict with cost breakdown
         """
         model = model or self.model
-        
-        # Pricing per 1M tokens (as of 2025)
-        pricing = {
-            "gpt-4": {"input": 30.0, "output": 60.0},
-            "gpt-4-turbo": {"input": 10.0, "output": 30.0},
-            "gpt-3.5-turbo": {"input": 0.5, "output": 1.5},
-            "claude-3-opus": {"input": 15.0, "output": 75.0},
-            "claude-3-sonnet": {"input": 3.0, "output": 15.0},
-            "default": {"input": 10.0, "output": 30.0}
-        }
-        
-        rates = pricing.get(model, pricing["default"])
+        rates = MODEL_PRICING.get(model, MODEL_PRICING["default"])
         
         input_cost = (input_tokens / 1_000_000) * rates["input"]
         output_cost = (output_tokens / 1_000_000) * rates["output"]
@@ -692,6 +711,10 @@ class TokenLimitGuard:
         }
 
 
+# Shell metacharacters rejected in git refs (one regex scan instead of one per char)
+UNSAFE_REF_CHARS = re.compile(r"[;&|`$()<>\n]")
+
+
 def get_git_diff(
     ref: str = "HEAD",
     max_files: Optional[int] = None,
@@ -710,8 +733,7 @@ def get_git_diff(
         Git diff text
     """
     # Sanitize ref (WHY: prevent command injection)
-    bad_chars = [';', '&', '|', '`', '$', '(', ')', '>', '<', '\n']
-    if any(c in ref for c in bad_chars):
+    if UNSAFE_REF_CHARS.search(ref):
         raise ValueError(f"Invalid git ref: {ref}")
     
     try: